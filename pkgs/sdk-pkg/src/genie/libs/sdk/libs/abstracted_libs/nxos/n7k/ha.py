@@ -16,6 +16,9 @@ from unicon.eal.dialogs import Statement, Dialog
 # module logger
 log = logging.getLogger(__name__)
 
+# Prompt of the debug plugin shell
+DEBUG_PLUGIN_PROMPT = r'^(.*)Linux\(debug\)#\s?$'
+
 
 class HA(HA_nxos):
 
@@ -76,8 +79,11 @@ class HA(HA_nxos):
         except:
             raise Exception("Couldn't delete the debug plugin from 'bootflash'")
 
-        self.device.state_machine.get_state('enable').add_state_pattern(
-            [r'^(.*)Linux\(debug\)#\s?$'])
+        # the pattern stays on the state machine of the device, only add it
+        # on the first load
+        enable = self.device.state_machine.get_state('enable')
+        if DEBUG_PLUGIN_PROMPT not in enable.pattern:
+            enable.add_state_pattern([DEBUG_PLUGIN_PROMPT])
         self.device.execute('load bootflash:debug_plugin.tmp', timeout=5)
 
     def _reconnect(self, steps, timeout, sleep_disconnect=30):
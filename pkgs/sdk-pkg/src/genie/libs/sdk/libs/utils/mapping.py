@@ -27,6 +27,31 @@ log = logging.getLogger(__name__)
 
 VOWEL = set(['a', 'e', 'i', 'o', 'u'])
 
+# Key of a NotExists requirement, as in NotExists('vlan')
+NOT_EXISTS_KEY = re.compile(r'NotExists\(\'(?P<required_key>[\w]+)\'\)')
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_regex(regex):
+    '''Compile a requirement regex once, as the same ones are matched
+    every time a trigger runs'''
+    return re.compile(regex)
+
+
+class BackoffTimeout(Timeout):
+    '''Timeout which polls soon after the trigger action and doubles the
+    wait between polls up to interval'''
+
+    def __init__(self, max_time, interval, first_interval=1, **kwargs):
+        super().__init__(max_time=max_time, interval=interval, **kwargs)
+        self.max_interval = interval
+        self.interval = min(first_interval, interval)
+
+    def sleep(self):
+        super().sleep()
+        self.interval = min(self.interval * 2, self.max_interval)
+
+
 class Mapping(object):
     def __init__(self, config_info=None, verify_ops=None, requirements=None,
                  verify_conf=None, num_values=None,  **kwargs):
@@ -156,7 +181,8 @@ class Mapping(object):
         new_requirements = []
         for req in reqs:
             # At this stage this could be a list of a list,  or a
-            # list.
+            # list. Requirement paths have to be lists, not tuples, as
+            # the nesting is told apart with isinstance(..., list)
 
             if isinstance(req[0], list):
                 # Then its a list of list
@@ -666,7 +692,9 @@ class Mapping(object):
                                 .format(str(diff)))
 
     def _verify_same(self, ops, initial, exclude, **kwargs):
-        diff = Diff(initial, ops, exclude=exclude + ['callables', 'maker'])
+        # exclude can be any iterable of keys
+        diff = Diff(initial, ops,
+                    exclude=list(exclude) + ['callables', 'maker'])
         diff.findDiff()
         if diff.diffs:
             raise Exception("Current ops is not equal to the initial Snapshot "
@@ -777,31 +805,26 @@ class Mapping(object):
                         step.failed('Issue verifying the states',
                             from_exception=e)
                 else:
-                    failures = []
-                    for kwarg in kwargs:
-                        try:
-                            if issubclass(abstracted_obj, OpsBase):
-                                instantiated_object = abstracted_obj(device=device, **kwargs)
-                                self._verify_ops(device, instantiated_object,
-                                                 reqs, missing, obj,
-                                                 requirements)
-                            elif issubclass(abstracted_obj, ConfBase):
-                                self._verify_conf_2(device, abstracted_obj, reqs,
-                                                    missing, obj, requirements)
-                        except Exception as e:
-                            failures.append([kwarg, e])
-
-                    if failures:
-                        failures_text = ''
-                        for kwarg, e in failures:
-                            text = format_filter_exception(\
-                                       exc_type=type(e),
-                                       exc_value=e,
-                                       tb=e.__traceback__)
-                            failures_text += '{n} - {k}:\n\n{t}\n\n'.\
-                                             format(n=obj, k=kwargs, t=text)
-                        step.failed('Issue verifying the states\n{f}'.\
-                                    format(f=failures_text))
+                    # Every kwarg is verified with the same kwargs, so one
+                    # learn answers for all of them
+                    try:
+                        if issubclass(abstracted_obj, OpsBase):
+                            instantiated_object = abstracted_obj(device=device, **kwargs)
+                            self._verify_ops(device, instantiated_object,
+                                             reqs, missing, obj,
+                                             requirements)
+                        elif issubclass(abstracted_obj, ConfBase):
+                            self._verify_conf_2(device, abstracted_obj, reqs,
+                                                missing, obj, requirements)
+                    except Exception as e:
+                        # One learn so the failure is reported once
+                        text = format_filter_exception(\
+                                   exc_type=type(e),
+                                   exc_value=e,
+                                   tb=e.__traceback__)
+                        step.failed('Issue verifying the states\n'
+                                    '{n} - {k}:\n\n{t}\n\n'.\
+                                    format(n=obj, k=kwargs, t=text))
 
                 log.info('{n} has been verified and is valid'
                             .format(n=name))
@@ -825,8 +848,24 @@ class Mapping(object):
                             "applied correctly as per the exception: "
                             "{e}".format(e=e))
 
+    def _poll_timeout(self, requirements):
+        '''Timeout to poll the verify_ops requirements with.
+
+        With 'poll_backoff' in the requirements, the first poll is done after
+        that many seconds and the wait doubles up to the trigger interval,
+        as the state usually changes well before the interval expires.
+        '''
+        first_interval = requirements.get('poll_backoff')
+        if not first_interval:
+            return self.timeout
+        return BackoffTimeout(max_time=self.timeout.max_time,
+                              interval=self.timeout.interval,
+                              first_interval=first_interval)
+
     def _verify_ops(self, device, o, reqs, missing, ops, requirements):
 
+        timeout = self._poll_timeout(requirements)
+
         # verify callable if requirements path
         # contains customized verify functions
         if reqs.get('callable', None):
@@ -834,7 +873,7 @@ class Mapping(object):
                 try:
                     o.learn_poll(ops_keys=self.sdata, verify=item[0].func,
                                  mapping=self, local_reqs=reqs,
-                                 timeout=self.timeout, **item[0].keywords)
+                                 timeout=timeout, **item[0].keywords)
                 except Exception as e:
                     raise e
 
@@ -842,7 +881,7 @@ class Mapping(object):
         try:
             o.learn_poll(ops_keys=self.sdata, verify=self._verify_finds_ops,
                          requirements=reqs['list'],
-                         timeout=self.timeout,
+                         timeout=timeout,
                          missing=missing,
                          obj_mod=ops,
                          org_req=requirements)
@@ -856,10 +895,9 @@ class Mapping(object):
         # Handling the case of 'NotExists' in the trigger prerequisites
         required_key = ''
         if obj:
-            compiled_line = re.compile(r'NotExists\(\'(?P<required_key>[\w]+)\'\)')
             for req in self.requirements[obj]['requirements']:
                 for key in req:
-                    matched = compiled_line.match(str(key))
+                    matched = NOT_EXISTS_KEY.match(str(key))
                     if matched:
                         required_key = str(matched.groupdict()['required_key'])
 
@@ -990,7 +1028,7 @@ class Mapping(object):
                     elif item.startswith('(?P<'):
                         # Modify it with an item of key
                         try:
-                            com = re.compile(item)
+                            com = _compile_regex(item)
                         except Exception as e:
                             raise ValueError("'{item}' is not a valid regex "
                                              "expression".format(item=item))\
@@ -1095,7 +1133,7 @@ class Mapping(object):
                         continue
                     # Modify it with an item of key
                     try:
-                        com = re.compile(item)
+                        com = _compile_regex(item)
                     except Exception as e:
                         raise ValueError("'{item}' is not a valid regex "
                                         "expression".format(item=item)) from e
@@ -1351,7 +1389,7 @@ class Mapping(object):
                 # and add to regex list
                 if isinstance(req, str) and req.startswith('(?P<'):
                     try:
-                        com = re.compile(req)
+                        com = _compile_regex(req)
                         value = list(com.groupindex)[0]
                         if value not in all_reqs_name:
                             regexs.append([value, com.pattern])
@@ -1462,7 +1500,7 @@ class FilterFindValue():
 class Different(object):
     def __init__(self, regex):
         regex = regex
-        com = re.compile(regex)
+        com = _compile_regex(regex)
         self.value = list(com.groupindex)[0]
 
     def __call__(self, keys):
@@ -0,0 +1,50 @@
+#! /usr/bin/env python
+import unittest
+from unittest import mock
+
+from genie.libs.sdk.libs.utils.mapping import BackoffTimeout
+
+
+class test_backoff_timeout(unittest.TestCase):
+
+    def setUp(self):
+        # Fake clock moved forward by every sleep
+        self.now = 1000.0
+        self.sleeps = []
+
+        def sleep(seconds):
+            self.sleeps.append(seconds)
+            self.now += seconds
+
+        patcher_time = mock.patch('time.time', lambda: self.now)
+        patcher_sleep = mock.patch('time.sleep', sleep)
+        patcher_time.start()
+        patcher_sleep.start()
+        self.addCleanup(patcher_time.stop)
+        self.addCleanup(patcher_sleep.stop)
+
+    def poll(self, timeout):
+        while timeout.iterate():
+            timeout.sleep()
+
+    def test_intervals_double_up_to_interval(self):
+        timeout = BackoffTimeout(max_time=20, interval=8, first_interval=1)
+        self.poll(timeout)
+        self.assertEqual(self.sleeps, [1, 2, 4, 8, 8])
+
+    def test_max_time_caps_total_wait(self):
+        timeout = BackoffTimeout(max_time=60, interval=15, first_interval=1)
+        self.poll(timeout)
+        # no poll starts after max_time has passed
+        self.assertLess(sum(self.sleeps[:-1]), 60)
+        self.assertGreaterEqual(sum(self.sleeps), 60)
+        self.assertEqual(max(self.sleeps), 15)
+
+    def test_first_interval_above_interval(self):
+        timeout = BackoffTimeout(max_time=10, interval=5, first_interval=30)
+        self.poll(timeout)
+        self.assertEqual(self.sleeps, [5, 5])
+
+
+if __name__ == '__main__':
+    unittest.main()
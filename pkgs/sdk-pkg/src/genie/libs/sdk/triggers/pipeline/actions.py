@@ -1,5 +1,6 @@
 import os
 import time
+import logging
 from datetime import datetime
 from .yangexec import run_netconf
 from .cliverify import CliVerify
@@ -23,16 +24,13 @@ def run_sleep(cls, action, data, testbed):
 
 
 def run_repeat(cls, action, data, testbed):
-    cls.log.info('{0}'.format(action))
+    cls.log.info('%s', action)
     return True
 
 
 def run_empty(cls, action={}, data={}, testbed={}):
-    cls.log.error('NOT IMPLEMENTED: {0}\n{1}'.format(
-            action.get('action', 'missing'),
-            action
-        )
-    )
+    cls.log.error('NOT IMPLEMENTED: %s\n%s',
+                  action.get('action', 'missing'), action)
     return True
 
 
@@ -40,11 +38,11 @@ def run_timestamp(cls, action, data, testbed):
     graph = action.get('storage', '')
     precision = action.get('precision', 0)
     category = action.get('category', '')
-    n = datetime.now()
-    cls.log.debug('TIMESTAMP: DATE: {0} TIME: {1}'.format(
-        n.strftime("%Y-%m-%d"),
-        n.strftime("%H:%M:%S.%f")
-    ))
+    if cls.log.isEnabledFor(logging.DEBUG):
+        n = datetime.now()
+        cls.log.debug('TIMESTAMP: DATE: %s TIME: %s',
+                      n.strftime("%Y-%m-%d"),
+                      n.strftime("%H:%M:%S.%f"))
     return True
 
 
@@ -62,7 +60,9 @@ class ActionMeta(type):
 
     @classmethod
     def __prepare__(metacls, name, bases):
-        return actiondict
+        return dict(actiondict)
 
-    def __new__(cls, name, bases, actiondict):
-        return type.__new__(cls, name, bases, actiondict)
+    def __new__(cls, name, bases, namespace):
+        # action name to function, looked up once per action run
+        namespace['_action_table'] = dict(actiondict)
+        return type.__new__(cls, name, bases, namespace)
@@ -1,5 +1,6 @@
 import logging
 import re
+from itertools import chain
 from deepdiff import DeepDiff
 from ats.log.utils import banner
 from .utility import DataRetriever
@@ -15,11 +16,18 @@ class CliVerify:
         # check if connected
         if not hasattr(self.uut, 'cli'):
             self.uut.connect(alias='cli', via=self.connection)
-        elif hasattr(self.uut, 'cli') and not self.uut.cli.connected:
+        elif not self.uut.cli.connected:
             self.uut.cli.connect()
         self.cmd, self.returns = DataRetriever.get_data(action, data)
         self.operation = action.get('operation')
-        self.cc = CiscoConfig()
+        # Pre/post RPC configs are common for all tests of a single suite
+        self.common_cli_base = {}
+        self.common_cli_diff = {}
+        self.cc = CISCO_CONFIG
+        # expected returns are static so normalize them only once
+        self._returns_normalized = None
+        if self.returns:
+            self._returns_normalized = self.cc.normalize(self.returns)
 
     def run_cli(self):
         """Execute CLI commands."""
@@ -41,7 +49,7 @@ class CliVerify:
 
         if self.returns:
             added, removed = self.cc.diffs(
-                self.cc.normalize(self.returns),
+                self._returns_normalized,
                 self.cc.normalize(resp)
             )
             if added:
@@ -107,9 +115,9 @@ class CliVerify:
           kind (str): Contains "basic " plus create, merge, replace, delete,
                       or remove.
         Returns:
-          (list): Expected CLI after RPC is run.
+          (str): Expected CLI after RPC is run.
         """
-        expect = []
+        expect = ()
         index = counter + xpath
         replay_type = kind[kind.find('basic ') + 6:]
 
@@ -127,10 +135,11 @@ class CliVerify:
                 added,
                 removed)
             )
-            expect = added + removed
+            # stored as a tuple so merge/remove can join it without copying
+            expect = tuple(chain(added, removed))
             self.common_cli_diff[index] = expect
         elif replay_type in ['merge', 'remove']:
-            expect = self.common_cli_diff.get(index, [])
+            expect = self.common_cli_diff.get(index, ())
 
         return ''.join(expect)
 
@@ -143,56 +152,61 @@ class CliVerify:
 class CiscoConfig:
     """CiscoConfig processes CLI commands to detect differences.
 
-    Normalize CLI of 2 examples and determine differences.
+    Normalize CLI of 2 examples and determine differences.  It holds no
+    per-instance state so the module level CISCO_CONFIG is shared.
     """
 
-    skip = ["enable", "config", "t", "configure", "end", "show",
-            "terminal", "commit", "#", "!", "<rpc", "Building"]
+    skip = frozenset(["enable", "config", "t", "configure", "end", "show",
+                      "terminal", "commit", "#", "!", "<rpc", "Building"])
 
-    timestamps = ["mon", "tue", "wed", "thu", "fri", "sat", "sun", "jan",
-                  "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep",
-                  "oct", "nov", "dec"]
+    # comment and banner lines
+    _PREFIX_SKIP = ('#', '!', 'Current configuration')
 
-    timeregex = re.compile(
-        "^(([0-1]?[0-9])|([2][0-3])):([0-5]?[0-9])(:([0-5]?[0-9]))?"
+    # Line starting with a day or month name that has a HH:MM[:SS] token
+    _TIMESTAMP_LINE = re.compile(
+        r"^(?:mon|tue|wed|thu|fri|sat|sun|jan|feb|mar|apr|may|jun|jul|aug"
+        r"|sep|oct|nov|dec).*?\s(?:[0-1]?[0-9]|2[0-3]):[0-5]?[0-9]",
+        re.IGNORECASE
     )
 
-    def _handle_intf(self, intf):
+    @staticmethod
+    def _handle_intf(intf):
         # might be "interface GigabitEthernet 1/0/1"
         # or "interface GigabitEthernet1/0/1"
         intf_list = intf.split()
         intf_list.remove('interface')
         return "interface " + ''.join(intf_list)
 
-    def _handle_username(self, username):
+    @staticmethod
+    def _handle_username(username):
         # might be "username lab password 0 mypassword"
         # or "username lab password mypassword"
         return username.replace("password 0", "password", 1)
 
-    def _handle_exit(self, line):
+    @staticmethod
+    def _handle_exit(line):
         # clear out "exit" if found
         if len(line.split()) == 1:
             return None
         return line
 
-    special_handles = {"interface": _handle_intf,
-                       "username": _handle_username,
-                       "exit": _handle_exit}
-
-    def _check_special_handles(self, line):
+    special_handles = {"interface": _handle_intf.__func__,
+                       "username": _handle_username.__func__,
+                       "exit": _handle_exit.__func__}
 
-        if line.split()[0] in self.special_handles.keys():
-            line = self.special_handles[line.split()[0]](self, line)
+    @classmethod
+    def _check_special_handles(cls, line):
+        handle = cls.special_handles.get(line.split()[0])
+        if handle is not None:
+            line = handle(line)
         return line
 
-    def _check_timestamps(self, line):
-        if line[:3].lower() in self.timestamps:
-            for item in line.split():
-                if self.timeregex.match(item):
-                    return True
-        return False
+    @classmethod
+    def _check_timestamps(cls, line):
+        return cls._TIMESTAMP_LINE.match(line) is not None
 
-    def normalize(self, cfg):
+    @classmethod
+    def normalize(cls, cfg):
         """Removes uninteresting CLI and returns structured data.
 
         Remove comments, organize blocks of config data,
@@ -220,19 +234,15 @@ class CiscoConfig:
                 if not line.split():
                     # emptied line
                     continue
-            if line.startswith('#'):
-                continue
-            if line.startswith('!'):
-                continue
-            if line.startswith('Current configuration'):
+            if line.startswith(cls._PREFIX_SKIP):
                 continue
             if line.rstrip().endswith("#"):
                 continue
-            if line.split()[0] in self.skip:
+            if line.split()[0] in cls.skip:
                 continue
-            if self._check_timestamps(line):
+            if cls._check_timestamps(line):
                 continue
-            line = self._check_special_handles(line)
+            line = cls._check_special_handles(line)
             if line is None:
                 continue
 
@@ -240,7 +250,8 @@ class CiscoConfig:
 
         return clean_cfg
 
-    def diffs(self, cli_base, cli_after):
+    @staticmethod
+    def diffs(cli_base, cli_after):
         """Identify the difference between 2 lists of normalized CLI text.
 
         Args:
@@ -266,27 +277,34 @@ class CiscoConfig:
         for remove in removed:
             removed_cli.append('-' + remove.t1 + '\n')
 
+        if repetition:
+            # Map each line to its positions once instead of walking the
+            # DeepDiff tree for every repeated line.
+            idx_base = {}
+            idx_after = {}
+            for i, line in enumerate(cli_base):
+                idx_base.setdefault(line, []).append(i)
+            for i, line in enumerate(cli_after):
+                idx_after.setdefault(line, []).append(i)
+
         for rep in repetition:
             # Include line before repeated CLI
-            new_indexes = rep.repetition.get('new_indexes', [])
-            old_indexes = rep.repetition.get('old_indexes', [])
             if rep.repetition.get(
                 'old_repeat', 0) < rep.repetition.get(
                     'new_repeat', 0):
-                for new_index in new_indexes:
-                    line = rep.up.t2_child_rel.parent[new_index - 1]
-                    for old_index in old_indexes:
-                        if line == rep.up.t1_child_rel.parent[old_index - 1]:
-                            break
-                    else:
+                old_lines = {cli_base[i - 1] for i in idx_base[rep.t1]}
+                for i in idx_after[rep.t2]:
+                    line = cli_after[i - 1]
+                    if line not in old_lines:
                         added_cli.append(line + '\n' + rep.t2 + '\n')
             else:
-                for old_index in old_indexes:
-                    line = rep.up.t1_child_rel.parent[old_index - 1]
-                    for new_index in new_indexes:
-                        if line == rep.up.t2_child_rel.parent[new_index - 1]:
-                            break
-                    else:
+                new_lines = {cli_after[i - 1] for i in idx_after[rep.t2]}
+                for i in idx_base[rep.t1]:
+                    line = cli_base[i - 1]
+                    if line not in new_lines:
                         removed_cli.append(line + '\n-' + rep.t1 + '\n')
 
         return (added_cli, removed_cli)
+
+
+CISCO_CONFIG = CiscoConfig()
@@ -245,9 +245,12 @@ https://tools.ietf.org/html/rfc6020#section-9.13
                                   keep_ns_prefixes=sorted(self.keep_prefixes))
 
         if len(root_element) > 0:
-            log.debug('get_payload: constructed XML:\n%s',
-                      et.tostring(root_element, encoding='unicode',
-                                  pretty_print=True))
+            # Serializing the payload is as costly as building it so only
+            # do it when the XML will actually be logged
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug('get_payload: constructed XML:\n%s',
+                          et.tostring(root_element, encoding='unicode',
+                                      pretty_print=True))
         else:
             log.warning("No payload XML constructed")
 
@@ -1,7 +1,11 @@
 #! /usr/bin/env python
+import io
 import re
 import traceback
 import logging
+import operator
+from collections import defaultdict, deque
+from functools import lru_cache
 import lxml.etree as et
 try:
     from yangsuite import get_logger
@@ -10,6 +14,45 @@ except ImportError:
     log = logging.getLogger(__name__)
     log.setLevel(logging.DEBUG)
 
+# Logical operations an opfield can apply to a reply value
+_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '>=': operator.ge,
+    '<=': operator.le,
+    '>': operator.gt,
+    '<': operator.lt,
+}
+
+
+def _localname(tag):
+    """Local name of an lxml "{namespace}name" tag without a QName."""
+    return tag[tag.find('}') + 1:]
+
+
+def _element_xpath(el, name, xpaths):
+    """Xpath of el extended from its parent's xpath in xpaths.
+
+    Parents are always seen before their children so each xpath is built
+    from the parent's instead of walking up to the root.  The NETCONF
+    rpc-reply/data wrapper is not part of the xpath.
+    """
+    parent = el.getparent()
+    if name == 'data' and (parent is None or
+                           _localname(parent.tag) == 'rpc-reply'):
+        xpath = ''
+    else:
+        xpath = xpaths.get(parent, '') + '/' + name
+    xpaths[el] = xpath
+    return xpath
+
+
+def _next_field(bucket, consumed):
+    """Position of the first field in bucket not consumed yet, or None."""
+    while bucket and bucket[0] in consumed:
+        bucket.popleft()
+    return bucket[0] if bucket else None
+
 
 class RpcVerify():
     """Verification of NETCONF rpc and rpc-reply messages.
@@ -71,7 +114,7 @@ class RpcVerify():
 
     @property
     def with_defaults(self):
-        """List of NETCONF "with-defaults" device capabilities.
+        """Set of NETCONF "with-defaults" device capabilities.
 
         Used to apply RFC 6243 logic to determine "get-config" validity.
         """
@@ -90,14 +133,14 @@ class RpcVerify():
     @capabilities.setter
     def capabilities(self, caps=[]):
         self._capabilities = caps
-        self._with_defaults = []
+        self._with_defaults = frozenset()
         self._datastore = []
         for cap in caps:
             if ':netconf:capability:' not in cap:
                 continue
             if ':with-defaults:' in cap:
-                self._with_defaults = cap[cap.find('=') + 1:].split(
-                    '&also-supported='
+                self._with_defaults = frozenset(
+                    cap[cap.find('=') + 1:].split('&also-supported=')
                 )
             elif ':candidate:' in cap:
                 self._datastore.append('candidate')
@@ -123,30 +166,34 @@ class RpcVerify():
             * expect value (if any)
         """
         result = {}
-        expect_val = reply_val = None
-
-        if et.iselement(expect) and expect.text and expect.text.strip():
-            expect_val = expect.text.strip()
-            result['expect_val'] = expect_val
-
-        if et.iselement(reply) and reply.text and reply.text.strip():
-            reply_val = reply.text.strip()
-            result['reply_val'] = reply_val
+        # expect is '' when only the reply value is of interest
+        expect_val = getattr(expect, 'text', None)
+        if expect_val:
+            expect_val = expect_val.strip()
+            if expect_val:
+                result['expect_val'] = expect_val
+
+        reply_val = getattr(reply, 'text', None)
+        if reply_val:
+            reply_val = reply_val.strip()
+            if reply_val:
+                result['reply_val'] = reply_val
 
         if not reply_val and not expect_val:
             result['no_values'] = True
         elif reply_val and expect_val and reply_val != expect_val:
             # check if values have prefixes and are they correct?
-            if reply_val.count(':') == 1 and expect_val.count(':') == 1:
-                reply_pfx = reply_val.split(':')[0]
-                if reply_pfx in reply.nsmap.keys():
-                    result['reply_val'] = reply_val.split(':')[1]
-                    result['reply_prefix'] = reply_pfx
-                    result['expect_prefix'] = expect_val.split(':')[0]
-                    result['expect_val'] = expect_val.split(':')[1]
-                    # check values without their prefixes
-                    if result['reply_val'] == result['expect_val']:
-                        result['match'] = True
+            reply_pfx, reply_sep, reply_local = reply_val.partition(':')
+            expect_pfx, expect_sep, expect_local = expect_val.partition(':')
+            if reply_sep and expect_sep and ':' not in reply_local and \
+                    ':' not in expect_local and reply_pfx in reply.nsmap:
+                result['reply_val'] = reply_local
+                result['reply_prefix'] = reply_pfx
+                result['expect_prefix'] = expect_pfx
+                result['expect_val'] = expect_local
+                # check values without their prefixes
+                if reply_local == expect_local:
+                    result['match'] = True
         else:
             result['match'] = True
 
@@ -158,18 +205,23 @@ class RpcVerify():
         Args:
           resp (list) or (str) or (bytes): rpc-reply returned from ncclient.
         Returns:
-          str: rpc-reply in string form.
+          str or bytes: rpc-reply in the form it was received.
         """
+        resp_xml = ''
         if isinstance(resp, list):
-            if isinstance(resp[0], tuple):
+            if resp and isinstance(resp[0], tuple):
                 op, resp_xml = resp[0]
         elif isinstance(resp, (str, bytes)):
-            resp_xml = str(resp)
+            resp_xml = resp
         else:
             return ''
 
-        if resp_xml.strip().startswith('<?xml'):
-            return resp_xml[resp_xml.find('>') + 1:].strip()
+        if isinstance(resp_xml, bytes):
+            prolog = self.RE_XML_PROLOG_BYTES.match(resp_xml)
+        else:
+            prolog = self.RE_XML_PROLOG.match(resp_xml)
+        if prolog:
+            return resp_xml[prolog.end():]
 
         return resp_xml
 
@@ -187,54 +239,57 @@ class RpcVerify():
 
         Args:
           response (list): List of reply lxml.etree.Elements.
-          expected (list): List of expected lxml.etree.Elements.
+          expected (list): List of tuples (lxml.etree.Element, xpath,
+                           bool - tag is expected to be missing).
         Returns:
           tuple: bool - True if successfully processed objects.
                  list of expected lxml.etree.Elements.
                  list of reply lxml.etree.Elements.
         """
         result = True
-        should_be_missing = ''
-        unexpected = []
-        expect = []
+        should_be_missing = []
         # user put "-" (minus) in front of tags they expect to be missing
-        for elem, xpath in expected:
-            # minus was converted to "expected" attribute earlier
-            if elem.attrib.get('expected') == 'false':
-                unexpected.append((elem, xpath))
-            else:
-                expect.append((elem, xpath))
-        expected = expect
+        unexpected = [(elem, xpath) for elem, xpath, missing in expected
+                      if missing]
+        expected = [(elem, xpath) for elem, xpath, missing in expected
+                    if not missing]
+
+        if not unexpected:
+            return (result, expected, response)
+
+        # unexpected tags by (tag, xpath) in expected order
+        unexpected_index = defaultdict(list)
+        for unexpect, unexpect_xpath in unexpected:
+            unexpected_index[(unexpect.tag, unexpect_xpath)].append(unexpect)
 
         for reply, xpath in response:
-            for unexpect, unexpect_xpath in unexpected:
-                if reply.tag == unexpect.tag and xpath == unexpect_xpath:
-                    value_state = self._process_values(reply, unexpect)
-                    if 'explicit' in self.with_defaults:
-                        # Only tags set by client sould be in reply
-                        should_be_missing += reply.tag + ' '
-                        should_be_missing += value_state.get('reply_val', '')
-                        should_be_missing += '\n'
-                        result = False
-                        break
-                    elif 'report-all' in self.with_defaults:
-                        if 'match' not in value_state:
-                            continue
-                        # TODO: RFC6243 - if value is default it should match
-                        should_be_missing += reply.tag + ' '
-                        should_be_missing += value_state.get('reply_val', '')
-                        should_be_missing += '\n'
-                        result = False
-                        break
-                    elif 'match' in value_state or 'no_values' in value_state:
-                        should_be_missing += reply.tag
-                        should_be_missing += '\n'
-                        result = False
+            for unexpect in unexpected_index.get((reply.tag, xpath), ()):
+                value_state = self._process_values(reply, unexpect)
+                if 'explicit' in self.with_defaults:
+                    # Only tags set by client sould be in reply
+                    should_be_missing.append('{0} {1}\n'.format(
+                        reply.tag, value_state.get('reply_val', '')
+                    ))
+                    result = False
+                    break
+                elif 'report-all' in self.with_defaults:
+                    if 'match' not in value_state:
+                        continue
+                    # TODO: RFC6243 - if value is default it should match
+                    should_be_missing.append('{0} {1}\n'.format(
+                        reply.tag, value_state.get('reply_val', '')
+                    ))
+                    result = False
+                    break
+                elif 'match' in value_state or 'no_values' in value_state:
+                    should_be_missing.append(reply.tag + '\n')
+                    result = False
 
         if should_be_missing:
             self.log.error(
                 "{0} Following tags should be missing:\n\n{1}"
-                .format('OPERATIONAL-VERIFY FAILED:', should_be_missing)
+                .format('OPERATIONAL-VERIFY FAILED:',
+                        ''.join(should_be_missing))
             )
 
         return (result, expected, response)
@@ -335,27 +390,26 @@ class RpcVerify():
                     )
                     return False
                 if value.isnumeric():
-                    eval_text = value + ' ' + field['op'] + ' '
-                    eval_text += field['value']
+                    v1 = int(value)
+                    v2 = int(field['value'])
+                    s1, s2 = value, field['value']
                 else:
                     try:
                         # See if we are dealing with floats
                         v1 = float(value)
                         v2 = float(field['value'])
-                        eval_text = str(v1) + ' ' + field['op'] + ' ' + str(v2)
+                        s1, s2 = v1, v2
                     except (TypeError, ValueError):
-                        eval_text = '"' + value + '" ' + field['op']
-                        eval_text += ' "' + field['value'] + '"'
-                if eval(eval_text):
-                    self.log.debug(
-                        'OPERATION VALUE {0}: {1} SUCCESS'.format(
-                            field['name'], eval_text
-                        )
-                    )
+                        v1, v2 = value, field['value']
+                        s1, s2 = '"' + value + '"', '"' + field['value'] + '"'
+                op = _OPERATORS.get(field['op'])
+                if op is not None and op(v1, v2):
+                    self.log.debug('OPERATION VALUE %s: %s %s %s SUCCESS',
+                                   field['name'], s1, field['op'], s2)
                 else:
                     self.log.error(
-                        'OPERATION VALUE {0}: {1} FAILED'.format(
-                            field['name'], eval_text
+                        'OPERATION VALUE {0}: {1} {2} {3} FAILED'.format(
+                            field['name'], s1, field['op'], s2
                         )
                     )
                     return False
@@ -385,30 +439,35 @@ class RpcVerify():
             self.log.error("OPERATIONAL STATE FAILED: No opfields")
             return False
 
+        opfields = [f for f in opfields
+                    if f.get('selected', True) is not False]
+        # field positions by (xpath, name) in opfields order
+        field_by_xpath = defaultdict(deque)
+        for pos, field in enumerate(opfields):
+            if 'xpath' in field:
+                field_by_xpath[(field['xpath'], field['name'])].append(pos)
+        consumed = set()
+
         for reply, reply_xpath in response:
+            bucket = field_by_xpath.get((reply_xpath, _localname(reply.tag)))
+            pos = _next_field(bucket, consumed)
+            if pos is None:
+                continue
+            consumed.add(pos)
             value_state = self._process_values(reply, '')
             value = value_state.get('reply_val', 'empty')
-            for field in opfields:
-                if field.get('selected', True) is False:
-                    opfields.remove(field)
-                    continue
-                if 'xpath' in field and field['xpath'] == reply_xpath and \
-                        et.QName(reply).localname == field['name']:
-                    if not self.check_opfield(value, field):
-                        result = False
-                    opfields.remove(field)
-                    break
+            if not self.check_opfield(value, opfields[pos]):
+                result = False
 
+        opfields = [f for pos, f in enumerate(opfields) if pos not in consumed]
         if opfields:
             # Missing fields in rpc-reply
-            msg = 'OPERATIONAL STATE FAILED: Missing value(s)\n'
+            msg = ['OPERATIONAL STATE FAILED: Missing value(s)\n']
             for opfield in opfields:
-                if opfield.get('selected', True) is False:
-                    continue
-                msg += opfield.get('xpath', '') + ' value: '
-                msg += opfield.get('value', '')
-                msg += '\n'
-            self.log.error(msg)
+                msg.append('{0} value: {1}\n'.format(
+                    opfield.get('xpath', ''), opfield.get('value', '')
+                ))
+            self.log.error(''.join(msg))
             result = False
 
         return result
@@ -427,90 +486,123 @@ class RpcVerify():
           bool: True if successful.
         """
         result = True
-        missing_ns_msg = ''
-        wrong_values = ''
-        missing_tags = ''
+        missing_ns_msg = []
+        wrong_values = []
+        missing_tags = []
         ns_set = set()
+        # namespace values already ingested / already found in ns_set
+        seen_nsmaps = set()
+        known_nsmaps = set()
         value_sequence_number = 0
+        # reply tags by (tag, xpath) in response order
+        reply_index = defaultdict(deque)
+        for reply, reply_xpath in response:
+            reply_index[(reply.tag, reply_xpath)].append((reply, reply_xpath))
+        matched = set()
+        # selected opfield positions by (xpath, name) and by sequence id
+        field_by_xpath = defaultdict(deque)
+        field_by_id = defaultdict(deque)
+        consumed = set()
+        fields_left = 0
+        if opfields:
+            opfields = [f for f in opfields
+                        if f.get('selected', True) is not False]
+            for pos, field in enumerate(opfields):
+                if 'xpath' in field:
+                    field_by_xpath[(field['xpath'], field['name'])].append(pos)
+                if 'id' in field:
+                    field_by_id[int(field['id'])].append(pos)
+            fields_left = len(opfields)
+        # per element lookups bound once for the loop
+        process_values = self._process_values
+        netconf_ns = self.NETCONF_NAMESPACE
 
         for expect, xpath in expected:
-            for reply, reply_xpath in response:
-                if reply.tag == expect.tag and xpath == reply_xpath:
-                    break
-            else:
+            bucket = reply_index.get((expect.tag, xpath))
+            if not bucket:
                 # Missing an expected tag
-                missing_tags += expect.tag + '\n'
+                missing_tags.append(expect.tag + '\n')
                 result = False
                 continue
+            reply, reply_xpath = bucket.popleft()
+            matched.add(id(reply))
             # add namespace to the set as we parse through the response/expect
-            for ns in expect.nsmap.values():
-                ns_set.add(ns)
-
-            for ns in reply.nsmap.values():
-                if ns != self.NETCONF_NAMESPACE and ns not in ns_set:
-                    missing_ns_msg += 'Tag:{0} Namespace:{1}\n'.format(
-                        et.QName(expect.tag).localname, ns
-                    )
-                    result = False
+            expect_ns = tuple(expect.nsmap.values())
+            if expect_ns not in seen_nsmaps:
+                seen_nsmaps.add(expect_ns)
+                ns_set.update(expect_ns)
+
+            reply_ns = tuple(reply.nsmap.values())
+            if reply_ns not in known_nsmaps:
+                missing = False
+                for ns in reply_ns:
+                    if ns != netconf_ns and ns not in ns_set:
+                        missing_ns_msg.append('Tag:{0} Namespace:{1}\n'.format(
+                            _localname(expect.tag), ns
+                        ))
+                        result = False
+                        missing = True
+                if not missing:
+                    # ns_set only grows so these are known from now on
+                    known_nsmaps.add(reply_ns)
 
-            value_state = self._process_values(reply, expect)
+            value_state = process_values(reply, expect)
 
             if 'no_values' in value_state:
-                response.remove((reply, reply_xpath))
                 continue
 
-            if opfields and 'reply_val' in value_state:
+            if fields_left and 'reply_val' in value_state:
                 # We have a value and we have opfields. The opfields may not be
-                # in sequence, so loop through and see if this is a field we
-                # are interested in.
-                for field in opfields:
-                    if field.get('selected', True) is False:
-                        opfields.remove(field)
-                        continue
-                    if 'xpath' in field and reply_xpath == field['xpath'] and \
-                            et.QName(reply).localname == field['name']:
-                        if not self.check_opfield(value_state['reply_val'],
-                                                  field):
-                            result = False
-                        opfields.remove(field)
-                        break
-                    elif value_sequence_number == int(field['id']):
-                        # Backward compatible - not as reliable
-                        # because fields may be out of order
-                        if not self.check_opfield(value_state['reply_val'],
-                                                  field):
-                            result = False
-                        opfields.remove(field)
-                        break
+                # in sequence, so look up the first field we are interested in
+                # by xpath or, backward compatible but not as reliable because
+                # fields may be out of order, by sequence number.
+                candidates = [
+                    pos for pos in (
+                        _next_field(field_by_xpath.get(
+                            (reply_xpath, _localname(reply.tag))), consumed),
+                        _next_field(field_by_id.get(value_sequence_number),
+                                    consumed)
+                    ) if pos is not None
+                ]
+                if candidates:
+                    pos = min(candidates)
+                    consumed.add(pos)
+                    fields_left -= 1
+                    if not self.check_opfield(value_state['reply_val'],
+                                              opfields[pos]):
+                        result = False
 
                 value_sequence_number += 1
 
             elif 'match' not in value_state:
-                wrong_values += 'Tag:{0} Value:{1} Expected:{2}\n'.format(
-                    et.QName(expect.tag).localname,
+                wrong_values.append('Tag:{0} Value:{1} Expected:{2}\n'.format(
+                    _localname(expect.tag),
                     value_state.get('reply_val', 'None'),
                     value_state.get('expect_val', 'None')
-                )
+                ))
                 result = False
-            response.remove((reply, reply_xpath))
+
+        # Whatever was not matched is left in the response
+        response[:] = [(reply, reply_xpath) for reply, reply_xpath in response
+                       if id(reply) not in matched]
 
         if not result:
             if missing_tags:
                 self.log.error("{0} Following tags are missing:\n{1}".format(
                         'OPERATIONAL-VERIFY FAILED',
-                        missing_tags
+                        ''.join(missing_tags)
                     )
                 )
             if missing_ns_msg:
                 self.log.error("{0} Missing namespaces:\n{1}".format(
                         'OPERATIONAL-VERIFY FAILED',
-                        missing_ns_msg
+                        ''.join(missing_ns_msg)
                     )
                 )
             if wrong_values:
                 self.log.error("{0} Wrong values:\n{1}".format(
                         'OPERATIONAL-VERIFY FAILED',
-                        wrong_values
+                        ''.join(wrong_values)
                     )
                 )
         if len(response) and 'explicit' in self.with_defaults:
@@ -525,9 +617,14 @@ class RpcVerify():
 
         return result
 
+    # XML declaration in front of an rpc-reply
+    RE_XML_PROLOG = re.compile(r'\s*<\?xml.*?\?>\s*', re.DOTALL)
+    RE_XML_PROLOG_BYTES = re.compile(br'\s*<\?xml.*?\?>\s*', re.DOTALL)
     # Pattern to detect keys in an xpath
-    RE_FIND_KEYS = re.compile(r'\[.*?\]')
-    RE_FIND_PREFIXES = re.compile(r'/.*?:')
+    RE_FIND_KEYS = re.compile(r'\[[^\]]*\]')
+    RE_FIND_PREFIXES = re.compile(r'/[^/:]+:')
+    # Expected XML tag with a "-" (minus) in front of it
+    RE_MINUS_TAG = re.compile(r'^- *<([-0-9a-z:A-Z_]+)', re.MULTILINE)
 
     def verify_rpc_data_reply(self, response, rpc_data, opfields=[]):
         nodes = []
@@ -535,8 +632,8 @@ class RpcVerify():
             edit_op = node.get('edit-op')
             if edit_op in ['delete', 'remove']:
                 continue
-            xpath = re.sub(self.RE_FIND_KEYS, '', node.get('xpath', ''))
-            xpath = re.sub(self.RE_FIND_PREFIXES, '/', xpath)
+            xpath = self.RE_FIND_KEYS.sub('', node.get('xpath', ''))
+            xpath = self.RE_FIND_PREFIXES.sub('/', xpath)
             value = node.get('value', '')
             if not value:
                 value = 'empty'
@@ -555,60 +652,102 @@ class RpcVerify():
         """Transform XML into elements with associated xpath.
 
         Args:
-          resp (list) or (str): list returned from netconf_send or
-                                well formed rpc-reply XML.
+          resp (list) or (str) or (bytes) or (lxml.Element): list returned
+            from netconf_send, well formed rpc-reply XML or an already
+            parsed rpc-reply.
         Returns:
           list: List of tuples (lxml.Element, xpath (str))
         """
-        resp_xml = self._get_resp_xml(resp)
+        if et.iselement(resp):
+            # Already parsed so walk the tree instead of parsing it again
+            context = None
+            elements = resp.iter(et.Element)
+        else:
+            resp_xml = self._get_resp_xml(resp)
 
-        if not resp_xml:
-            self.log.error(
-                "OPERATIONAL-VERIFY FAILED: No response to verify."
-            )
-            return False
+            if not resp_xml:
+                self.log.error(
+                    "OPERATIONAL-VERIFY FAILED: No response to verify."
+                )
+                return False
+
+            if not isinstance(resp_xml, bytes):
+                resp_xml = resp_xml.encode('utf-8')
+            context = et.iterparse(io.BytesIO(resp_xml), events=('start',),
+                                   huge_tree=True)
+            elements = (el for event, el in context)
 
+        # Associate xpaths with response tags while the reply is parsed;
+        # start events come in document order, parents before children
+        response = []
+        xpaths = {}
         try:
-            resp = et.fromstring(resp_xml.encode('utf-8'))
+            for el in elements:
+                name = _localname(el.tag)
+                xpath = _element_xpath(el, name, xpaths)
+                if name == 'rpc-reply':
+                    # Don't evaluate rpc-reply tag
+                    continue
+                if not response and name == 'data':
+                    # Don't evaluate rpc-reply/data tag
+                    continue
+
+                response.append((el, xpath))
         except et.XMLSyntaxError as e:
             self.log.error('OPERATIONAL-VERIFY FAILED: Response XML:\n{0}'
                            .format(str(e)))
             log.error(traceback.format_exc())
             return False
 
+        if context is not None:
+            resp = context.root
         # if first element of reply is not 'rpc-reply' this is a bad response
-        if et.QName(resp).localname != 'rpc-reply':
+        if _localname(resp.tag) != 'rpc-reply':
             self.log.error(
                 "{0} Response missing rpc-reply:\nTag: {1}"
                 .format('OPERATIONAL-VERIFY FAILED:', resp[0])
             )
             return False
 
-        # Associate xpaths with response tags
-        response = []
-        xpath = []
-        for el in resp.iter():
-            if et.QName(el).localname == 'rpc-reply':
+        return response
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _parse_expected(expect_xml):
+        """Parse expected XML into tags with associated xpaths.
+
+        The same expected XML is usually verified against many replies so
+        the result is cached by text.  Elements are only read during
+        verification so cached elements are safe to share.
+
+        Args:
+          expect_xml (str): Expected rpc-reply XML.
+        Returns:
+          tuple: Tuples (lxml.Element, xpath (str), bool - tag is expected
+                 to be missing)
+        """
+        # Preprocess expected XML text for unexpected tags
+        # lines with "-" (minus) should not show up in reply
+        oper_expected = RpcVerify.RE_MINUS_TAG.sub(r'<\1 expected="false" ',
+                                                   expect_xml.strip())
+        expect = et.fromstring(oper_expected)
+
+        expected = []
+        xpaths = {}
+        # Associate xpaths with expected tags
+        for el in expect.iter():
+            name = _localname(el.tag)
+            xpath = _element_xpath(el, name, xpaths)
+            if name == 'rpc-reply':
                 # Don't evaluate rpc-reply tag
                 continue
-            if not response and et.QName(el).localname == 'data':
+            if not expected and name == 'data':
                 # Don't evaluate rpc-reply/data tag
                 continue
-            parent = el.getparent()
-            xpath.append('/' + et.QName(el).localname)
-            while True:
-                if parent is not None:
-                    xpath.append('/' + et.QName(parent).localname)
-                    parent = parent.getparent()
-                else:
-                    break
+            # minus was converted to "expected" attribute
+            expected.append((el, xpath, el.attrib.get('expected') == 'false'))
 
-            response.append(
-                (el, ''.join(reversed(xpath)).replace('/rpc-reply/data', ''))
-            )
-            xpath = []
-
-        return response
+        return tuple(expected)
 
     def parse_rpc_expected(self, resp_xml, expect_xml, opfields=[]):
         """Check if values are correct according expected XML.
@@ -633,7 +772,8 @@ class RpcVerify():
         the value, and if the operation returns True, the field test passed.
 
         Args:
-          resp_xml (str): Actual rpc-reply XML.
+          resp_xml (str) or (lxml.Element): Actual rpc-reply XML or an
+            already parsed rpc-reply.
           expected_xml (str): Expected rpc-reply XML.
           opfields (list): Expected values and operations to perform.
         Return:
@@ -650,23 +790,14 @@ class RpcVerify():
             )
             return False
 
-        if not resp_xml:
+        if not et.iselement(resp_xml) and not resp_xml:
             self.log.error(
                 "OPERATIONAL-VERIFY FAILED: No response to verify."
             )
             return False
 
-        # Preprocess expected XML text for unexpected tags
-        lines = expect_xml.strip().splitlines()
-        oper_expected = ""
-        for line in lines:
-            # lines with "-" (minus) should not show up in reply
-            line = re.sub(r'^- *<([-0-9a-z:A-Z_]+)',
-                          r'<\1 expected="false" ', line)
-            oper_expected += line + "\n"
-
         try:
-            expect = et.fromstring(oper_expected)
+            expected = self._parse_expected(expect_xml)
         except et.XMLSyntaxError as e:
             self.log.error('OPERATIONAL-VERIFY FAILED: Expected XML:\n{0}'
                            .format(str(e)))
@@ -678,36 +809,6 @@ class RpcVerify():
             # Returning an empty list is ok
             return False
 
-        expected = []
-        xpath = []
-        # Associate xpaths with expected tags
-        for el in expect.iter():
-            if et.QName(el).localname == 'rpc-reply':
-                # Don't evaluate rpc-reply tag
-                continue
-            if not expected and et.QName(el).localname == 'data':
-                # Don't evaluate rpc-reply/data tag
-                continue
-            xpath.append('/' + et.QName(el).localname)
-            parent = el.getparent()
-            while True:
-                if parent is not None:
-                    xpath.append('/' + et.QName(parent).localname)
-                    parent = parent.getparent()
-                else:
-                    break
-            expected.append(
-                (
-                    el,
-                    re.sub(
-                        r'^/rpc-reply/data|^/data',
-                        '',
-                        ''.join(reversed(xpath)),
-                    )
-                )
-            )
-            xpath = []
-
         # Expected XML should have at least one top level tag with one child
         if 'explicit' in self.with_defaults and len(expected) < 2:
             expected = []
@@ -715,7 +816,7 @@ class RpcVerify():
         # Is any data expected to be returned?
         if expected and 'explicit' in self.with_defaults:
             # First element will always be top container so check it's child
-            top_child, child_xpath = expected[1]
+            top_child = expected[1][0]
             # Attribute expected=false was added to unexpected elements
             if 'expected' in top_child.attrib:
                 # Top level child is expected to be gone so we expect no data
@@ -850,7 +951,9 @@ unicast</af-name>
     log = logging.getLogger("RPC-verfiy")
     logging.basicConfig(level=logging.DEBUG)
     rpcv = RpcVerify(log=log)
-    result = rpcv.parse_rpc_expected(test_recurse_reply, test_recurse_reply)
+    # parse the reply once, the expected XML parse is cached by text
+    recurse_reply = et.fromstring(test_recurse_reply.strip())
+    result = rpcv.parse_rpc_expected(recurse_reply, test_recurse_reply)
     if result:
         print('\n**** RECURSE TEST PASSED ****\n')
     else:
@@ -0,0 +1,33 @@
+#! /usr/bin/env python
+import unittest
+
+from genie.libs.sdk.triggers.pipeline.cliverify import CiscoConfig
+
+
+class test_cisco_config_normalize(unittest.TestCase):
+
+    def test_skipped_lines(self):
+        cfg = ('Building configuration...\n'
+               '!\n'
+               'hostname R1\n'
+               '\n'
+               'interface GigabitEthernet 1/0/1\n'
+               ' description uplink\n'
+               'end\n')
+        self.assertEqual(CiscoConfig.normalize(cfg),
+                         ['hostname R1',
+                          'interface GigabitEthernet1/0/1',
+                          'description uplink'])
+
+    def test_line_boundaries(self):
+        # every line boundary str.splitlines() knows about
+        for sep in ('\n', '\r\n', '\r', '\v', '\f', '\x1c', '\x85',
+                    '\u2028', '\u2029'):
+            cfg = 'hostname R1{0}ip domain name lab{0}'.format(sep)
+            self.assertEqual(CiscoConfig.normalize(cfg),
+                             ['hostname R1', 'ip domain name lab'],
+                             repr(sep))
+
+
+if __name__ == '__main__':
+    unittest.main()
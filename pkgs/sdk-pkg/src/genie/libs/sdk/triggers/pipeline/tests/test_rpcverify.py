@@ -0,0 +1,180 @@
+#! /usr/bin/env python
+import unittest
+from unittest.mock import Mock
+
+from genie.libs.sdk.triggers.pipeline.rpcverify import RpcVerify
+
+REPLY = """\
+<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0" message-id="101">
+  <data>
+    <top xmlns="urn:pipeline:test">
+      <entry>
+        <name>one</name>
+        <mtu>1500</mtu>
+      </entry>
+      <entry>
+        <name>two</name>
+        <mtu>9000</mtu>
+      </entry>
+    </top>
+  </data>
+</rpc-reply>
+"""
+
+PROLOG = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+class test_check_opfield(unittest.TestCase):
+
+    def setUp(self):
+        self.rpcv = RpcVerify(log=Mock())
+
+    def check(self, value, op, expect):
+        field = {'name': 'leaf', 'op': op, 'value': expect}
+        return self.rpcv.check_opfield(value, field)
+
+    def test_equal(self):
+        self.assertTrue(self.check('10', '==', '10'))
+        self.assertTrue(self.check('up', '==', 'up'))
+        self.assertFalse(self.check('10', '==', '11'))
+        self.assertFalse(self.check('up', '==', 'down'))
+
+    def test_not_equal(self):
+        self.assertTrue(self.check('10', '!=', '11'))
+        self.assertTrue(self.check('up', '!=', 'down'))
+        self.assertFalse(self.check('10', '!=', '10'))
+
+    def test_greater_equal(self):
+        self.assertTrue(self.check('10', '>=', '10'))
+        self.assertTrue(self.check('11', '>=', '10'))
+        self.assertFalse(self.check('9', '>=', '10'))
+
+    def test_less_equal(self):
+        self.assertTrue(self.check('10', '<=', '10'))
+        self.assertTrue(self.check('9', '<=', '10'))
+        self.assertFalse(self.check('11', '<=', '10'))
+
+    def test_greater(self):
+        self.assertTrue(self.check('11', '>', '10'))
+        self.assertFalse(self.check('10', '>', '10'))
+
+    def test_less(self):
+        self.assertTrue(self.check('9', '<', '10'))
+        self.assertFalse(self.check('10', '<', '10'))
+
+    def test_numbers_compared_as_numbers(self):
+        # "9" > "10" as strings but not as integers
+        self.assertFalse(self.check('9', '>', '10'))
+        self.assertTrue(self.check('2.5', '<', '10.0'))
+
+    def test_number_against_string(self):
+        self.assertFalse(self.check('10', '==', 'ten'))
+        self.assertFalse(self.check('ten', '!=', '10'))
+
+    def test_range(self):
+        self.assertTrue(self.check('5', 'range', '1,10'))
+        self.assertTrue(self.check('5', 'range', '1 10'))
+        self.assertTrue(self.check('5', 'range', '1-10'))
+        self.assertFalse(self.check('11', 'range', '1,10'))
+        self.assertFalse(self.check('five', 'range', '1,10'))
+
+    def test_unknown_operator(self):
+        self.assertFalse(self.check('10', '=~', '10'))
+
+
+class test_process_rpc_reply(unittest.TestCase):
+
+    def setUp(self):
+        self.rpcv = RpcVerify(log=Mock())
+
+    def xpaths(self, response):
+        return [xpath for el, xpath in response]
+
+    def test_empty_reply(self):
+        for resp in ('', b'', [], None):
+            self.assertIs(self.rpcv.process_rpc_reply(resp), False)
+
+    def test_str_reply(self):
+        response = self.rpcv.process_rpc_reply(REPLY)
+        self.assertEqual(self.xpaths(response)[:3],
+                         ['/top', '/top/entry', '/top/entry/name'])
+        self.assertEqual(len(response), 7)
+
+    def test_bytes_reply(self):
+        response = self.rpcv.process_rpc_reply(REPLY.encode('utf-8'))
+        self.assertEqual(self.xpaths(response),
+                         self.xpaths(self.rpcv.process_rpc_reply(REPLY)))
+
+    def test_prolog_removed(self):
+        self.assertEqual(self.rpcv._get_resp_xml(PROLOG + REPLY), REPLY)
+        self.assertEqual(
+            self.rpcv._get_resp_xml((PROLOG + REPLY).encode('utf-8')),
+            REPLY.encode('utf-8'))
+        response = self.rpcv.process_rpc_reply(
+            (PROLOG + REPLY).encode('utf-8'))
+        self.assertEqual(len(response), 7)
+
+    def test_netconf_send_reply(self):
+        response = self.rpcv.process_rpc_reply([('get', PROLOG + REPLY)])
+        self.assertEqual(len(response), 7)
+
+    def test_missing_rpc_reply(self):
+        self.assertIs(
+            self.rpcv.process_rpc_reply('<data><top/></data>'), False)
+
+
+class test_repeated_keys(unittest.TestCase):
+
+    def setUp(self):
+        self.rpcv = RpcVerify(log=Mock())
+
+    def expect(self, first, second):
+        return """\
+<top xmlns="urn:pipeline:test">
+  <entry>
+    <name>{0}</name>
+  </entry>
+  <entry>
+    <name>{1}</name>
+  </entry>
+</top>""".format(first, second)
+
+    def test_entries_matched_in_order(self):
+        self.assertTrue(
+            self.rpcv.parse_rpc_expected(REPLY, self.expect('one', 'two')))
+
+    def test_entries_out_of_order(self):
+        self.assertFalse(
+            self.rpcv.parse_rpc_expected(REPLY, self.expect('two', 'one')))
+
+    def test_missing_entry(self):
+        expect = self.expect('one', 'two').replace(
+            '</top>', '  <entry>\n    <name>three</name>\n  </entry>\n</top>')
+        self.assertFalse(self.rpcv.parse_rpc_expected(REPLY, expect))
+
+    def test_opfields_consumed_in_order(self):
+        opfields = [
+            {'name': 'mtu', 'xpath': '/top/entry/mtu', 'op': '==',
+             'value': '1500'},
+            {'name': 'mtu', 'xpath': '/top/entry/mtu', 'op': '>',
+             'value': '1500'},
+        ]
+        response = self.rpcv.process_rpc_reply(REPLY)
+        self.assertTrue(
+            self.rpcv.process_operational_state(response, opfields))
+        opfields.reverse()
+        self.assertFalse(
+            self.rpcv.process_operational_state(response, opfields))
+
+    def test_opfield_missing_from_reply(self):
+        opfields = [
+            {'name': 'mtu', 'xpath': '/top/entry/mtu', 'op': '>',
+             'value': '0'},
+        ] * 3
+        response = self.rpcv.process_rpc_reply(REPLY)
+        self.assertFalse(
+            self.rpcv.process_operational_state(response, opfields))
+
+
+if __name__ == '__main__':
+    unittest.main()
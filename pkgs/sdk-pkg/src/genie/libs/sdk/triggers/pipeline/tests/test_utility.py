@@ -0,0 +1,112 @@
+#! /usr/bin/env python
+import unittest
+from collections import namedtuple
+
+import yaml
+
+from genie.libs.sdk.triggers.pipeline.utility import (DataRetriever,
+                                                     OrderedDumper,
+                                                     OrderedLoader,
+                                                     render_variables)
+
+
+class test_render_variables(unittest.TestCase):
+
+    def test_default_identifier(self):
+        self.assertEqual(
+            render_variables('hostname {{ name }}', {'name': 'R1'}),
+            'hostname R1'
+        )
+
+    def test_xpath_identifier(self):
+        self.assertEqual(
+            render_variables('/native/hostname[name="_- name -_"]',
+                             {'name': 'R1'}),
+            '/native/hostname[name="R1"]'
+        )
+
+    def test_trailing_newline_kept(self):
+        self.assertEqual(
+            render_variables('hostname {{ name }}\n', {'name': 'R1'}),
+            'hostname R1\n'
+        )
+        self.assertEqual(
+            render_variables('hostname _- name -_\n', {'name': 'R1'}),
+            'hostname R1\n'
+        )
+
+    def test_no_markers(self):
+        text = 'interface Loopback0\n'
+        self.assertIs(render_variables(text, {'name': 'R1'}), text)
+
+
+class test_data_retriever(unittest.TestCase):
+
+    def test_string(self):
+        data = {'cli': {'type': 'string', 'content': 'show version',
+                        'returns': 'Version'}}
+        action = {'content': 'cli', 'returns': 'cli'}
+        self.assertEqual(DataRetriever.get_data(action, data),
+                         ('show version', 'Version'))
+
+    def test_reference(self):
+        data = {
+            'ref': {'type': 'reference', 'content': 'cli',
+                    'returns': 'cli'},
+            'cli': {'type': 'string', 'content': 'show version',
+                    'returns': 'Version'},
+        }
+        action = {'content': 'ref', 'returns': 'ref'}
+        self.assertEqual(DataRetriever.get_data(action, data),
+                         ('show version', 'Version'))
+
+    def test_chained_reference(self):
+        data = {
+            'ref1': {'type': 'reference', 'content': 'ref2'},
+            'ref2': {'type': 'reference', 'content': 'cli'},
+            'cli': {'type': 'string', 'content': 'show version'},
+        }
+        action = {'content': 'ref1'}
+        self.assertEqual(DataRetriever.get_data(action, data),
+                         ('show version', []))
+
+    def test_xpath_reference(self):
+        data = {
+            'ref': {'type': 'reference', 'content': 'rpc'},
+            'rpc': {'type': 'xpath', 'namespace': 'ns',
+                    'nodes': [{'xpath': '/top:top'}]},
+            'ns': {'content': {'top': 'urn:pipeline:test'}},
+        }
+        content, returns = DataRetriever.get_data({'content': 'ref'}, data)
+        self.assertIs(content, data['rpc'])
+        self.assertEqual(content['namespace'], {'top': 'urn:pipeline:test'})
+
+    def test_no_content(self):
+        self.assertEqual(DataRetriever.get_data({}, {}), ([], []))
+
+
+class test_ordered_yaml(unittest.TestCase):
+
+    def round_trip(self, data):
+        return yaml.load(yaml.dump(data, Dumper=OrderedDumper),
+                         Loader=OrderedLoader)
+
+    def test_mapping_order_kept(self):
+        data = {'zulu': 1, 'alpha': 2, 'mike': {'yankee': 3, 'bravo': 4}}
+        loaded = self.round_trip(data)
+        self.assertEqual(loaded, data)
+        self.assertEqual(list(loaded), ['zulu', 'alpha', 'mike'])
+        self.assertEqual(list(loaded['mike']), ['yankee', 'bravo'])
+
+    def test_tuple_dumped_as_sequence(self):
+        Point = namedtuple('Point', 'x y')
+        data = [{'action': 'cli', 'after_rpc': ('show run', 1, None)},
+                {'action': 'yang', 'point': Point(1, 2)}]
+        self.assertEqual(
+            self.round_trip(data),
+            [{'action': 'cli', 'after_rpc': ['show run', 1, None]},
+             {'action': 'yang', 'point': [1, 2]}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,19 +2,16 @@
 import sys
 from pprint import pprint as pp
 import json
-from collections import OrderedDict
 import yaml
-import yamlordereddictloader
+from genie.libs.sdk.triggers.pipeline.utility import OrderedLoader
 
 
 def load(filename):
     #
-    # Load test YAML file as OrderedDict:
+    # Load test YAML file as dict:
     #
-    test = yaml.load(
-        open(filename),
-        Loader=yamlordereddictloader.Loader
-    )
+    with open(filename) as fd:
+        test = yaml.load(fd, Loader=OrderedLoader)
 
     print('\n\nYAML to DICT\n\n')
     pp(test)
@@ -24,10 +21,10 @@ def load(filename):
     with open(filename.replace('.yaml', '.json'), 'w') as fd:
         json.dump(test, fd, indent=2)
     #
-    # Load test JSON file as OrderedDict:
+    # Load test JSON file as dict:
     #
     with open(filename.replace('.yaml', '.json')) as fd:
-        test = json.load(fd, object_pairs_hook=OrderedDict)
+        test = json.load(fd)
     print('\n\nJSON to DICT\n\n')
     pp(test)
 
@@ -0,0 +1,117 @@
+#! /usr/bin/env python
+import unittest
+from unittest.mock import MagicMock, Mock
+
+from genie.libs.sdk.triggers.pipeline.yangexec import (gen_ncclient_rpc,
+                                                      netconf_send,
+                                                      run_netconf)
+
+
+class test_gen_ncclient_rpc(unittest.TestCase):
+
+    def rpc_data(self, value):
+        return {
+            'operation': 'edit-config',
+            'datastore': 'running',
+            'namespace': {'top': 'urn:pipeline:test'},
+            'nodes': [{'xpath': '/top:top/top:leaf', 'value': value}],
+        }
+
+    def test_values_coerced_to_str(self):
+        for value, text in ((5, '5'), (True, 'True'), (None, 'None'),
+                            ('text', 'text')):
+            rpc_data = self.rpc_data(value)
+            op, kwargs = gen_ncclient_rpc(rpc_data)
+            self.assertEqual(op, 'edit-config')
+            self.assertEqual(rpc_data['nodes'][0]['value'], text)
+            leaf = kwargs['config'].find('.//{urn:pipeline:test}leaf')
+            self.assertEqual(leaf.text, text)
+
+
+class test_netconf_send(unittest.TestCase):
+
+    def setUp(self):
+        self.uut = Mock()
+        self.uut.nc.connected = True
+        self.uut.nc.lock.return_value = Mock(ok=True)
+        self.rpcs = [
+            ('edit-config', {'target': 'running', 'config': '<config/>'}),
+            ('edit-config', {'target': 'running', 'config': '<config/>'}),
+        ]
+
+    def test_unlock_after_failed_rpc(self):
+        self.uut.nc.edit_config.side_effect = [Exception('timeout'),
+                                               Mock(ok=True)]
+        result = netconf_send(self.uut, self.rpcs)
+        self.assertEqual(result[0], ('traceback', ''))
+        self.assertEqual(result[1][0], 'edit-config')
+        self.uut.nc.lock.assert_called_once_with(target='running')
+        self.uut.nc.unlock.assert_called_once_with(target='running')
+
+    def test_unlock_after_all_rpcs_fail(self):
+        self.uut.nc.edit_config.side_effect = Exception('timeout')
+        result = netconf_send(self.uut, self.rpcs)
+        self.assertEqual(result, [('traceback', '')] * 2)
+        self.uut.nc.unlock.assert_called_once_with(target='running')
+
+    def test_failed_unlock_keeps_result(self):
+        self.uut.nc.edit_config.return_value = Mock(ok=True)
+        self.uut.nc.unlock.side_effect = Exception('session closed')
+        result = netconf_send(self.uut, self.rpcs)
+        self.assertEqual([op for op, reply in result],
+                         ['edit-config', 'edit-config'])
+
+    def test_no_lock(self):
+        self.uut.nc.edit_config.return_value = Mock(ok=True)
+        netconf_send(self.uut, self.rpcs, lock=False)
+        self.uut.nc.lock.assert_not_called()
+        self.uut.nc.unlock.assert_not_called()
+
+
+class test_run_netconf(unittest.TestCase):
+
+    def setUp(self):
+        self.uut = Mock()
+        self.uut.name = 'uut'
+        self.uut.nc.connected = True
+        self.uut.nc.server_capabilities = []
+        self.uut.nc.lock.return_value = Mock(ok=True)
+        self.testbed = Mock(devices={'uut': self.uut})
+        self.action = {'operation': 'edit-config', 'datastore': 'running',
+                       'content': 'rpc'}
+        self.data = {'rpc': {
+            'type': 'xpath',
+            'namespace': {'top': 'urn:pipeline:test'},
+            'nodes': [{'xpath': '/top:top/top:leaf', 'value': '5'}],
+        }}
+
+    def reply(self, xml):
+        ret = MagicMock(ok=True)
+        ret.__str__.return_value = xml
+        return ret
+
+    def test_edit_error_skips_get_config(self):
+        self.uut.nc.edit_config.return_value = Mock(
+            ok=False, errors=[],
+            xml='<rpc-reply><rpc-error>bad</rpc-error></rpc-reply>')
+        self.assertFalse(
+            run_netconf(self.action, self.data, self.testbed, Mock()))
+        self.uut.nc.get_config.assert_not_called()
+        self.uut.nc.unlock.assert_called_once_with(target='running')
+
+    def test_edit_verified_after_unlock(self):
+        self.uut.nc.edit_config.return_value = self.reply(
+            '<rpc-reply><ok/></rpc-reply>')
+        self.uut.nc.get_config.return_value = self.reply(
+            '<rpc-reply xmlns="urn:ietf:params:xml:ns:netconf:base:1.0">'
+            '<data><top xmlns="urn:pipeline:test"><leaf>5</leaf></top>'
+            '</data></rpc-reply>')
+        self.assertTrue(
+            run_netconf(self.action, self.data, self.testbed, Mock()))
+        calls = [name for name, args, kwargs in self.uut.nc.mock_calls
+                 if name in ('edit_config', 'unlock', 'get_config')]
+        self.assertEqual(calls, ['edit_config', 'unlock', 'get_config'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,18 +1,13 @@
-import sys
-import argparse
-import time
 import logging
+from itertools import groupby
 import yaml
-import yamlordereddictloader
-from jinja2 import Template
 from ats import aetest
 from ats.log.utils import banner
-from ats.utils.objects import find, R
-from genie.utils.loadattr import str_to_list
 from genie.harness.base import Trigger
 from genie.libs.sdk.triggers.blitz.blitz import Blitz
 
 from .actions import ActionMeta
+from .utility import OrderedDumper, OrderedLoader, render_variables
 
 
 log = logging.getLogger(__name__)
@@ -22,10 +17,14 @@ log = logging.getLogger(__name__)
 class TestSpec(Trigger):
     """Model Pipeline Test Specification."""
 
+    # consecutive actions of these types are reported as one step
+    lightweight_actions = frozenset(['sleep', 'repeat', 'timestamp'])
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         tb_dict = self.parameters['testbed']._to_dict()
         self.variables = tb_dict.get('custom', {}).get('variables', {})
+        self.variables.update(self.parameters.get('variables', {}))
         self.data = {}
         self.actions = []
         self.action_runner = ActionRunner()
@@ -36,19 +35,12 @@ class TestSpec(Trigger):
 
     @data.setter
     def data(self, param_data):
-        self.variables.update(self.parameters.get('variables', {}))
         if not param_data:
             self._data = {}
         else:
-            data_str = yaml.dump(
-                param_data,
-                Dumper=yamlordereddictloader.Dumper
-            )
-            data_str = self._substitute_variables(data_str)
-            self._data = yaml.load(
-                data_str,
-                Loader=yamlordereddictloader.Loader
-            )
+            self._data = self._substitute_in_tree(param_data)
+        # variables are only substituted once in non-empty data
+        self._data_rendered = bool(param_data)
 
     @property
     def actions(self):
@@ -61,43 +53,70 @@ class TestSpec(Trigger):
         else:
             actions_str = yaml.dump(
                 param_actions,
-                Dumper=yamlordereddictloader.Dumper
+                Dumper=OrderedDumper
             )
             actions_str = self._substitute_variables(actions_str)
             self._actions = yaml.load(
                 actions_str,
-                Loader=yamlordereddictloader.Loader
+                Loader=OrderedLoader
             )
 
     def _substitute_variables(self, data_str):
         """Replace variables with valid values."""
         try:
             # default is {{ myvaraible }}
-            tpl = Template(data_str)
-            data_str = tpl.render(self.variables)
             # for xpath, variable is _- myvariable -_
-            tpl2 = Template(data_str,
-                            variable_start_string="_-",
-                            variable_end_string="-_")
-            data_str = tpl2.render(self.variables)
+            data_str = render_variables(data_str, self.variables)
         except TypeError:
             pass
         return data_str
 
+    def _substitute_in_tree(self, obj):
+        """Copy of data with variables replaced in every string."""
+        if isinstance(obj, str):
+            return self._substitute_variables(obj)
+        if isinstance(obj, dict):
+            return type(obj)(
+                (self._substitute_in_tree(k), self._substitute_in_tree(v))
+                for k, v in obj.items()
+            )
+        if isinstance(obj, list):
+            return [self._substitute_in_tree(x) for x in obj]
+        return obj
+
     def _step_test(self, step, testbed):
-        if not self.data:
+        if not self._data_rendered:
             self.data = self.parameters.get('data', {})
         if not self.actions:
             self.actions = self.parameters.get('test_actions', {})
 
-        for action in self.actions:
-            name = 'RUN ' + action.get('action', 'unknown')
-            with step.start(name.upper()) as test_step:
-                self.action_runner.run_banner(action)
-                self.action_runner.run_log(action)
-                if not self.action_runner.run(action, self.data, testbed):
+        for actions in self._step_batches(self.actions):
+            if len(actions) == 1:
+                name = 'RUN ' + actions[0].get('action', 'unknown').upper()
+            else:
+                name = 'RUN MISC'
+            with step.start(name) as test_step:
+                passed = True
+                for action in actions:
+                    self.action_runner.run_banner(action)
+                    self.action_runner.run_log(action)
+                    if not self.action_runner.run(action, self.data, testbed):
+                        passed = False
+                if not passed:
                     test_step.failed()
 
+    def _step_batches(self, actions):
+        """Group consecutive lightweight actions, others run alone."""
+        def is_light(action):
+            return action.get('action') in self.lightweight_actions
+
+        for light, group in groupby(actions, key=is_light):
+            if light:
+                yield list(group)
+            else:
+                for action in group:
+                    yield [action]
+
     @aetest.test
     def run_pipeline_test(self, testbed, steps, suites={}):
         """Run test actions defined in Model Pipeline tests."""
@@ -109,18 +128,16 @@ class ActionRunner(metaclass=ActionMeta):
 
     def __init__(self):
         self.log = logging.getLogger(__name__)
-        self.log.setLevel(logging.DEBUG)
 
     def run(self, action={'action': 'empty'}, params={}, testbed={}):
-        name = action.get('action', 'empty')
-        if not hasattr(self, name):
-            name = 'empty'
-        return getattr(self, name)(action, params, testbed)
+        run_action = self._action_table.get(action.get('action', 'empty'),
+                                            self._action_table['empty'])
+        return run_action(self, action, params, testbed)
 
     def run_banner(self, action):
-        if 'banner' in action:
-            self.log.debug(banner(action['banner']))
+        if 'banner' in action and self.log.isEnabledFor(logging.INFO):
+            self.log.info(banner(action['banner']))
 
     def run_log(self, action):
         if 'log' in action:
-            self.log.debug(action['log'])
+            self.log.info('%s', action['log'])
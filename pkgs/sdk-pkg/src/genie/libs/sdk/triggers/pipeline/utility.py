@@ -1,80 +1,143 @@
 """Utility functions for Model Pipeline Testing."""
+from functools import lru_cache
+import re
+import yaml
+from jinja2 import Template
+try:
+    from yaml import CSafeLoader as _SafeLoader, CSafeDumper as _SafeDumper
+except ImportError:
+    # PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader, SafeDumper as _SafeDumper
+
+# xpath variable identifiers _- myvariable -_
+_XPATH_VARIABLE = re.compile(r'_-\s*(.*?)\s*-_')
+
+
+@lru_cache(maxsize=1024)
+def _compile_template(text):
+    """Jinja2 template compiled once per text.
+
+    A trailing newline is kept so CLI blocks render unchanged.
+    """
+    return Template(text, keep_trailing_newline=True)
+
+
+def render_variables(text, variables):
+    """Replace variables in text with their values.
+
+    Default {{ myvariable }} and xpath _- myvariable -_ identifiers are
+    rendered in one pass.  Text without any template markers is returned
+    as is.
+    """
+    if '_-' in text:
+        text = _XPATH_VARIABLE.sub(r'{{ \1 }}', text)
+    if '{{' in text or '{%' in text or '{#' in text:
+        text = _compile_template(text).render(variables)
+    return text
+
+
+class OrderedLoader(_SafeLoader):
+    """YAML loader that keeps mapping order, using libyaml if available.
+
+    Mappings load as plain dict, which keeps insertion order.
+    """
+
+
+class OrderedDumper(_SafeDumper):
+    """YAML dumper that keeps mapping order, using libyaml if available."""
+
+
+def _represent_ordered_mapping(dumper, data):
+    return dumper.represent_mapping(
+        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+        data.items()
+    )
+
+
+OrderedDumper.add_representer(dict, _represent_ordered_mapping)
+# dict subclasses used for test parameters
+OrderedDumper.add_multi_representer(dict, _represent_ordered_mapping)
+
+
+def _represent_tuple(dumper, data):
+    # the safe dumper has no tuple representer; dump it as a plain sequence
+    return dumper.represent_list(data)
+
+
+OrderedDumper.add_multi_representer(tuple, _represent_tuple)
+
+
+def _get_value(data_content, source, data):
+    return data_content.get(source)
+
+
+def _get_xpath(data_content, source, data):
+    namespace = data_content.get('namespace')
+    if isinstance(namespace, dict):
+        # Already retrieved this from data reference
+        return data_content
+    else:
+        # Get the reference namespace from data
+        namespace = data.get(namespace)
+    data_content['namespace'] = namespace.get('content')
+    return data_content
 
 
 class DataRetriever:
 
-    def _get_data(self, data_content, content_type, source, data):
-        if content_type in ['string', 'opfields']:
-            return data_content.get(source)
-        elif content_type == 'xpath':
-            namespace = data_content.get('namespace')
-            if isinstance(namespace, dict):
-                # Already retrieved this from data reference
-                return data_content
-            else:
-                # Get the reference namespace from data
-                namespace = data.get(namespace)
-            data_content['namespace'] = namespace.get('content')
-            return data_content
-        elif content_type == 'reference':
-            return self.get_reference_data(
-                data_content,
-                data_content.get(source),
-                source
-            )
-        elif content_type == 'file':
-            return self.get_file_data(
-                data_content.get('filename'),
-                source
-            )
+    # content type to handler(data_content, source, data)
+    content_handlers = {
+        'string': _get_value,
+        'opfields': _get_value,
+        'xpath': _get_xpath,
+        'reference': lambda data_content, source, data:
+            DataRetriever.get_reference_data(
+                data_content.get(source), data, source
+            ),
+        'file': lambda data_content, source, data:
+            DataRetriever.get_file_data(data_content.get('filename'), source),
+    }
 
-    @classmethod
-    def get_content_data(cls, action, data):
-        content_idx = action.get('content', {})
-        if not content_idx:
-            return []
-        content = data.get(content_idx)
-        if not content:
-            # no expected content data
-            return content
-        if isinstance(content, dict):
-            content_type = content.get('type', 'string')
-        else:
-            return content
-        return cls._get_data(cls, content, content_type, 'content', data)
+    @staticmethod
+    def _get_data(data_content, content_type, source, data):
+        handler = DataRetriever.content_handlers.get(content_type)
+        if handler is not None:
+            return handler(data_content, source, data)
 
-    @classmethod
-    def get_returns_data(cls, action, data):
-        content_idx = action.get('returns', {})
+    @staticmethod
+    def _get_content(action, data, source):
+        content_idx = action.get(source, {})
         if not content_idx:
             return []
         content = data.get(content_idx)
         if not content:
-            # no expected return data
+            # no expected content or return data
             return content
-        if isinstance(content, dict):
-            content_type = content.get('type', 'string')
-        else:
+        if not isinstance(content, dict):
             return content
-        return cls._get_data(cls, content, content_type, 'returns', data)
+        return DataRetriever._get_data(
+            content, content.get('type', 'string'), source, data
+        )
 
-    @classmethod
-    def get_reference_data(cls, ref, data, source):
+    @staticmethod
+    def get_reference_data(ref, data, source):
         ref_data = data.get(ref)
         ref_type = ref_data.get('type')
         if ref_type == 'reference':
-            return cls.get_reference_data(cls, ref_data.get(source), source)
+            return DataRetriever.get_reference_data(
+                ref_data.get(source), data, source
+            )
         else:
-            return cls._get_data(cls, ref_data, ref_type, source)
+            return DataRetriever._get_data(ref_data, ref_type, source, data)
 
-    @classmethod
-    def get_file_data(cls, filename, source):
+    @staticmethod
+    def get_file_data(filename, source):
         # TODO: add this handling
         return ''
 
-    @classmethod
-    def get_data(cls, action, data):
+    @staticmethod
+    def get_data(action, data):
         return (
-            cls.get_content_data(action, data),
-            cls.get_returns_data(action, data)
+            DataRetriever._get_content(action, data, 'content'),
+            DataRetriever._get_content(action, data, 'returns')
         )
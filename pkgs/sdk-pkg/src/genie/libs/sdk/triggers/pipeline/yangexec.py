@@ -1,37 +1,43 @@
 import logging
+import random
 import traceback
+from time import sleep
 from copy import deepcopy
-from jinja2 import Template
+from functools import lru_cache
+import lxml.etree as et
 from ncclient.operations import RaiseMode
 from ats.log.utils import banner
-from .rpcbuilder import YSNetconfRPCBuilder
+from .rpcbuilder import YSNetconfRPCBuilder, NETCONF_NS_1_0
 from .rpcverify import RpcVerify
-from .utility import DataRetriever
+from .utility import DataRetriever, render_variables
 
 log = logging.getLogger(__name__)
 log.setLevel(logging.DEBUG)
 
+# NETCONF errors that mean the datastore lock may be free on a retry
+LOCK_RETRY_ERRORS = frozenset(['lock-denied', 'resource-denied',
+                               'in-use', 'operation-failed'])
+# First sleep between lock retries, doubled on each retry
+LOCK_RETRY_DELAY = 0.05
+
+# device name to (NETCONF session id, RpcVerify) for that session
+_RPC_VERIFY = {}
+
 
 def insert_variables(text, variables):
     if not text or not variables:
         # no op
         return text
-    tplt_standard = Template(text)
-    # standard identifiers for template
-    new_text = tplt_standard.render(variables)
-    # replay generator uses special identifiers in template
-    tplt_special = Template(new_text,
-                            variable_start_string='_-',
-                            variable_end_string='-_')
-
-    return tplt_special.render(variables)
+    # standard and replay generator special identifiers
+    return render_variables(text, variables)
 
 
 def try_lock(uut, target, timer=30, sleeptime=1):
     """Tries to lock the datastore to perform edit-config operation.
 
     Attempts to acquire the lock on the datastore. If exception thrown,
-    retries the lock on the datastore till the specified timer expires.
+    retries the lock on the datastore till the specified timer expires,
+    backing off exponentially between attempts.
 
     Helper function to :func:`lock_datastore`.
 
@@ -39,98 +45,122 @@ def try_lock(uut, target, timer=30, sleeptime=1):
         session (NetconfSession): active session
         target (str): Datastore to be locked
         timer: lock retry counter.
-        sleeptime: sleep timer.
+        sleeptime: longest sleep between retries.
 
     Returns:
         bool: True if datastore was successfully locked, else False.
     """
-    lock_retry_errors = ['lock-denied', 'resource-denied',
-                         'in-use', 'operation-failed']
+    delay = LOCK_RETRY_DELAY
     for counter in range(1, timer+1):
         ret = uut.nc.lock(target=target)
         if ret.ok:
             return True
-        retry = False
-        if ret.error.tag in lock_retry_errors:
-            retry = True
-        if not retry:
+        if ret.error.tag not in LOCK_RETRY_ERRORS:
             log.error('ERROR - CANNOT ACQUIRE LOCK - {0}'.format(
                 ret.error.tag))
             break
         elif counter < timer:
             log.info("RETRYING LOCK - {0}".format(counter))
-            sleep(sleeptime)
+            sleep(delay + random.uniform(0, delay / 2))
+            delay = min(delay * 2, sleeptime)
         else:
             log.error('ERROR - LOCKING FAILED. RETRY TIMER EXCEEDED!!!')
     return False
 
 
 def netconf_send(uut, rpcs, lock=True, lock_retry=40, timeout=30):
-    """Handle NETCONF messaging with exceptions caught by pyATS."""
+    """Handle NETCONF messaging with exceptions caught by pyATS.
+
+    A datastore locked for an edit-config stays locked for the rest of
+    the rpcs instead of being locked again for each edit.
+    """
     if not uut.nc.connected:
         uut.nc.connect()
 
     result = []
-
-    for nc_op, kwargs in rpcs:
-
-        try:
-            ret = ''
-
-            if nc_op == 'edit-config':
-                if lock:
-                    try_lock(uut, kwargs['target'], timer=lock_retry)
-
-                ret = uut.nc.edit_config(**kwargs)
-                if ret.ok and kwargs.get('target', '') == 'candidate':
+    # datastore locked by this call
+    locked = None
+
+    try:
+        for nc_op, kwargs in rpcs:
+
+            try:
+                ret = ''
+
+                target = None
+                if nc_op == 'edit-config':
+                    target = kwargs['target']
+                elif nc_op == 'rpc':
+                    rpc_command = kwargs.get('rpc_command', '')
+                    if et.iselement(rpc_command):
+                        rpc_command = et.tostring(rpc_command,
+                                                  encoding='unicode')
+                    if 'edit-config' in rpc_command:
+                        target = 'running'
+                        if 'candidate/>' in rpc_command:
+                            target = 'candidate'
+
+                if lock and target and locked != target:
+                    if locked:
+                        uut.nc.unlock(target=locked)
+                        locked = None
+                    if try_lock(uut, target, timer=lock_retry):
+                        locked = target
+
+                if nc_op == 'edit-config':
+                    ret = uut.nc.edit_config(**kwargs)
+                    if ret.ok and kwargs.get('target', '') == 'candidate':
+                        ret = uut.nc.commit()
+
+                elif nc_op == 'commit':
                     ret = uut.nc.commit()
-                if lock:
-                    uut.nc.unlock(target=kwargs['target'])
 
-            elif nc_op == 'commit':
-                ret = uut.nc.commit()
+                elif nc_op == 'get-config':
+                    ret = uut.nc.get_config(**kwargs)
+
+                elif nc_op == 'get':
+                    ret = uut.nc.get(**kwargs)
+
+                elif nc_op == 'rpc':
+                    # raw return
+                    return uut.nc.request(rpc_command)
+
+                if ret.ok:
+                    result.append((nc_op, str(ret)))
+
+                else:
+                    log.error("NETCONF Reply with error(s):")
+
+                    for rpcerror in ret.errors:
+                        if rpcerror.message:
+                            log.error("ERROR MESSAGE - {0}".format(
+                                rpcerror.message))
+
+                    if hasattr(ret, 'xml') and ret.xml is not None:
+                        result.append((nc_op, ret.xml))
+            except Exception:
+                log.error('ERROR - NETCONF {0} FAILED\n{1}'.format(
+                    nc_op, traceback.format_exc()))
+                result.append(('traceback', ''))
+                continue
+    finally:
+        if locked:
+            try:
+                uut.nc.unlock(target=locked)
+            except Exception:
+                # do not mask the result or the original exception
+                log.error(traceback.format_exc())
 
-            elif nc_op == 'get-config':
-                ret = uut.nc.get_config(**kwargs)
-
-            elif nc_op == 'get':
-                ret = uut.nc.get(**kwargs)
-
-            elif nc_op == 'rpc':
-                target = 'running'
-                if 'edit-config' in rpcs and lock:
-                    if 'candidate/>' in rpcs:
-                        target = 'candidate'
-                    try_lock(uut, target, timer=lock_retry)
-
-                # raw return
-                reply = uut.nc.request(rpcs)
-
-                if 'edit-config' in rpcs and lock:
-                    uut.nc.unlock(target)
-                return reply
-
-            if ret.ok:
-                result.append((nc_op, str(ret)))
-
-            else:
-                log.error("NETCONF Reply with error(s):")
+    return result
 
-                for rpcerror in ret.errors:
-                    if rpcerror.message:
-                        log.error("ERROR MESSAGE - {0}".format(
-                            rpcerror.message))
 
-                if hasattr(ret, 'xml') and ret.xml is not None:
-                    result.append((nc_op, ret.xml))
-        except Exception:
-            if lock:
-                uut.nc.unlock(target=kwargs['target'])
-            log.error(traceback.format_exc())
-            result.append(('traceback', ''))
-            continue
-
-    return result
+@lru_cache(maxsize=64)
+def _get_rpcbuilder(prefix_type, nsmap_items=frozenset(),
+                    netconf_ns=NETCONF_NS_1_0):
+    """RPC builder shared by all RPCs with the same prefixes and nsmap."""
+    return YSNetconfRPCBuilder(prefix_namespaces=prefix_type,
+                               nsmap=dict(nsmap_items),
+                               netconf_ns=netconf_ns)
 
 
 def gen_ncclient_rpc(rpc_data, prefix_type="minimal"):
@@ -170,7 +200,7 @@ def gen_ncclient_rpc(rpc_data, prefix_type="minimal"):
     with_defaults = rpc_data.get('with-defaults', '')
 
     # Add prefixes for all NETCONF containers
-    rpcbuilder = YSNetconfRPCBuilder(prefix_namespaces="always")
+    rpcbuilder = _get_rpcbuilder("always")
 
     container = None
 
@@ -185,18 +215,16 @@ def gen_ncclient_rpc(rpc_data, prefix_type="minimal"):
     else:
         container = rpcbuilder.netconf_element('TEMPORARY')
 
-    # Now create the builder for the payload
-    rpcbuilder = YSNetconfRPCBuilder(
-        prefix_namespaces=prefix_type,
-        nsmap=rpc_data.get('namespace', {}),
-        netconf_ns=None
-    )
+    # Now get the builder for the payload
+    nsmap = rpc_data.get('namespace') or {}
+    rpcbuilder = _get_rpcbuilder(prefix_type, frozenset(nsmap.items()), None)
+    # prefixes kept by a previous payload do not apply to this one
+    rpcbuilder.keep_prefixes.clear()
     # XML so all the values must be string or bytes type
-    nodes = []
-    for node in rpc_data['nodes']:
-        if 'value' in node:
+    nodes = rpc_data['nodes']
+    for node in nodes:
+        if 'value' in node and not isinstance(node['value'], str):
             node['value'] = str(node['value'])
-        nodes.append(node)
 
     rpcbuilder.get_payload(nodes, container)
 
@@ -227,6 +255,27 @@ def gen_ncclient_rpc(rpc_data, prefix_type="minimal"):
     return prt_op, kwargs
 
 
+def _get_rpc_verify(uut, logger):
+    """RpcVerify for the device's current NETCONF session.
+
+    Server capabilities do not change during a session so they are only
+    parsed again when the device reconnects with a new session.
+    """
+    session_id = getattr(uut.nc, 'session_id', None)
+    cached = _RPC_VERIFY.get(uut.name)
+    if cached is not None and session_id is not None and \
+            cached[0] == session_id:
+        rpc_verify = cached[1]
+        rpc_verify.log = logger
+        return rpc_verify
+    rpc_verify = RpcVerify(
+        log=logger,
+        capabilities=list(uut.nc.server_capabilities)
+    )
+    _RPC_VERIFY[uut.name] = (session_id, rpc_verify)
+    return rpc_verify
+
+
 def run_netconf(action, data, testbed, logger):
     """Form NETCONF message and send to testbed."""
     uut = testbed.devices[action.get('device', 'uut')]
@@ -236,10 +285,7 @@ def run_netconf(action, data, testbed, logger):
         uut.nc.raise_mode = RaiseMode.NONE
     elif hasattr(uut, 'nc') and not uut.nc.connected:
         uut.nc.connect()
-    rpc_verify = RpcVerify(
-        log=logger,
-        capabilities=list(uut.nc.server_capabilities)
-    )
+    rpc_verify = _get_rpc_verify(uut, logger)
     rpc_data, opfields = DataRetriever.get_data(action, data)
     if not rpc_data:
         logger.error('NETCONF message data index not present')
@@ -268,9 +314,7 @@ def run_netconf(action, data, testbed, logger):
         log.error(banner('NETCONF rpc-reply NOT RECIEVED'))
         return False
 
-    errors = [(op, res) for op, res in result if '<rpc-error>' in res]
-
-    if errors:
+    if any('<rpc-error>' in res for op, res in result):
         log.error(banner('NETCONF MESSAGE ERRORED'))
         return False
 
@@ -292,7 +336,7 @@ def run_netconf(action, data, testbed, logger):
         if not opfields:
             log.error(banner('No NETCONF data to compare rpc-reply to.'))
             return False
-        resp_elements = rpc_verify.process_rpc_reply(resp_xml)
+        resp_elements = rpc_verify.process_rpc_reply(result)
         return rpc_verify.process_operational_state(resp_elements, opfields)
 
     return True
@@ -1,16 +1,7 @@
 '''NXOS N9K Specific implementation of Restart process restart'''
 
-import time
-from datetime import datetime
 import logging
 
-from ats import aetest
-
-from genie.utils.diff import Diff
-from genie.utils.timeout import TempResult
-from genie.harness.utils import connect_device, disconnect_device
-from unicon.statemachine import State
-
 from ..processrestart import \
                       ProcessRestartLib as ProcessRestartLibNxos
 
@@ -19,6 +10,8 @@ log = logging.getLogger(__name__)
 class ProcessRestartLib(ProcessRestartLibNxos):
     '''Trigger class for ProcessCliRestart action'''
 
+    __slots__ = ()
+
     def crash_restart(self):
         '''Send configuration to shut
 
@@ -36,27 +29,16 @@ class ProcessRestartLib(ProcessRestartLibNxos):
         if not hasattr(self.device, 'debug_plugin'):
             raise Exception('No debug plugin has been loaded on the device.')
 
-        ha = self.abstract.sdk.libs.abstracted_libs.ha.HA(device=self.device,
-                                                          filetransfer=self.device.filetransfer)
-        # https://devxsupport.cisco.com/scp/tickets.php?id=39483
-        State('config', r'Linux')
-        State('exec', r'Linux')
-
+        ha = self._get_ha()
         ha.load_debug_plugin(self.device.debug_plugin)
 
+        # kill and leave the debug shell in one execute call; exit is not
+        # sent when the kill drops the connection
         try:
-            self.device.execute('kill -{cm} {p}\n'.\
-                                  format(p=self.previous_pid,
-                                         cm=self.obj.crash_method),
+            self.device.execute(['kill -%s %s\n' % (self.obj.crash_method,
+                                                    self.previous_pid),
+                                 'exit'],
                                 timeout=10)
         except Exception as e:
-            log.info('Exception raised is expected when running trigger '\
-                'through management connection. Exception: {e}'.format(e=e))
-            # Set pattern
-            restore_state = State(name='config', pattern=r'^.(%N\(config\))#\s?')
-            return
-
-        self.device.execute('exit', timeout=10)
-
-        # Set pattern
-        restore_state = State(name='config', pattern=r'^.(%N\(config\))#\s?')
+            log.info('Exception raised is expected when running trigger '
+                     'through management connection. Exception: %s', e)
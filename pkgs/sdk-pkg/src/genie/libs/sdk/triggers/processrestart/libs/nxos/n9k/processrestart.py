@@ -17,6 +17,8 @@ log = logging.getLogger(__name__)
 class ProcessRestartLib(ProcessRestartLibNxos):
     '''Trigger class for ProcessCliRestart action'''
 
+    __slots__ = ()
+
     def crash_restart(self):
         '''Send configuration to shut
 
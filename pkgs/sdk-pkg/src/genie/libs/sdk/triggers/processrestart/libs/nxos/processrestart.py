@@ -30,6 +30,13 @@ class ProcessRestartLib(object):
 
     no_log_check = ['sysmgr', 'syslogd', 'confcheck']
 
+    # Process restart state kept per instance
+    __slots__ = ('device', 'process', 'helper', 'obj', 'abstract',
+                 'verify_exclude', '_ha', '_ha_class', 'cmd', 'tag',
+                 'instance', 'previous_pid', 'previous_output',
+                 'previous_timestamp', 'previous_restart_count',
+                 'last_restart_time')
+
     def __init__(self, device, process, abstract, obj, verify_exclude):
         '''Initialize library'''
         self.device = device
@@ -41,6 +48,26 @@ class ProcessRestartLib(object):
         self.abstract = abstract
         self.verify_exclude = verify_exclude
 
+        # HA object of the device, shared by the trigger steps
+        self._ha = None
+        # HA class found through abstract
+        self._ha_class = None
+
+    def _get_ha_class(self):
+        '''HA class of the device, looked up through abstract on first use'''
+        if self._ha_class is None:
+            self._ha_class = self.abstract.sdk.libs.abstracted_libs.ha.HA
+        return self._ha_class
+
+    def _get_ha(self):
+        '''HA object of the device, built on first use'''
+        if self._ha is None:
+            filetransfer = self.device.filetransfer if \
+                                hasattr(self.device, 'filetransfer') else None
+            self._ha = self._get_ha_class()(
+                device=self.device, filetransfer=filetransfer)
+        return self._ha
+
     def process_information(self):
         '''Use for gathering initial information on the process'''
 
@@ -49,7 +76,9 @@ class ProcessRestartLib(object):
                 if self.device.testbed.devices[dev].alias == \
                     self.obj.parameters['helper']:
                     self.helper = device = self.device.testbed.devices[dev]
-                    self.helper.connect()
+                    # reuse the helper session of an earlier trigger
+                    if not self.helper.is_connected():
+                        self.helper.connect()
         else:
             device = self.device
 
@@ -180,7 +209,7 @@ class ProcessRestartLib(object):
             with steps.start('Verify process restart has created a core', \
                              continue_=True) as step:
                 filetransfer = self.device.filetransfer if hasattr(self.device, 'filetransfer') else None
-                ha = self.abstract.sdk.libs.abstracted_libs.ha.HA(
+                ha = self._get_ha_class()(
                     device=device, filetransfer=filetransfer)
                 cores = None
                 exception = None
@@ -386,8 +415,7 @@ class ProcessRestartLib(object):
         '''Reconnect to the device if needed'''
         if self.process in self.reconnect:
 
-            ha = self.abstract.sdk.libs.abstracted_libs.ha.HA(
-                device=self.device)
+            ha = self._get_ha()
             with steps.start('The device is reloading when restarting this process',
                              continue_=True) as step:
                 disconnect_device(self.device)
@@ -431,10 +459,7 @@ class ProcessRestartLib(object):
         with steps.start('Verify if no extra core has been generated',
                          continue_=True) as step:
             # Check if core of process is found
-            filetransfer = self.device.filetransfer if \
-                                hasattr(self.device, 'filetransfer') else None
-            ha = self.abstract.sdk.libs.abstracted_libs.ha.HA(
-                device=self.device, filetransfer=filetransfer)
+            ha = self._get_ha()
             temp = TempResult(container=step)
             cores = ha.check_cores()
             for core in cores:
@@ -84,8 +84,7 @@ class TriggerProcessRestart(ProcessRestartTemplate):
                         format(p=self.process), from_exception=e)
 
         if sleep_restart:
-            log.info("Sleeping for {s} before next "
-                     "restart".format(s=sleep_restart))
+            log.info("Sleeping for %s before next restart", sleep_restart)
             time.sleep(0)
 
     @aetest.test
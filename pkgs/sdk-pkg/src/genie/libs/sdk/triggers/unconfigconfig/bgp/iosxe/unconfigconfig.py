@@ -8,15 +8,16 @@ from genie.libs.sdk.triggers.unconfigconfig.unconfigconfig import TriggerUnconfi
 
 
 # Which key to exclude for BGP Ops comparison
-bgp_exclude = ['maker', 'bgp_session_transport', 'route_refresh',
-               'bgp_negotiated_capabilities', 'notifications', 'capability',
-               'keepalives', 'total', 'total_bytes', 'up_time', 'last_reset',
-               'bgp_negotiated_keepalive_timers', 'updates', 'opens',
-               'bgp_table_version', 'holdtime', 'keepalive_interval',
-               'distance_internal_as', 'bgp_neighbor_counters',
-               'memory_usage', 'total_entries', 'routing_table_version',
-               'total_memory', 'totals', 'distance_extern_as', 'reset_reason',
-               'holdtime', 'keepalive_interval']
+bgp_exclude = frozenset(['maker', 'bgp_session_transport', 'route_refresh',
+                         'bgp_negotiated_capabilities', 'notifications',
+                         'capability', 'keepalives', 'total', 'total_bytes',
+                         'up_time', 'last_reset',
+                         'bgp_negotiated_keepalive_timers', 'updates', 'opens',
+                         'bgp_table_version', 'holdtime', 'keepalive_interval',
+                         'distance_internal_as', 'bgp_neighbor_counters',
+                         'memory_usage', 'total_entries',
+                         'routing_table_version', 'total_memory', 'totals',
+                         'distance_extern_as', 'reset_reason'])
 
 
 class TriggerUnconfigConfigBgp(TriggerUnconfigConfig):
@@ -84,5 +85,6 @@ class TriggerUnconfigConfigBgp(TriggerUnconfigConfig):
                       verify_ops={'ops.bgp.bgp.Bgp':{
                                     'requirements': [[NotExists('info')]],
                                     'kwargs':{'attributes':['info']},
-                                    'exclude': bgp_exclude}},
+                                    'exclude': bgp_exclude,
+                                    'poll_backoff': 1}},
                       num_values={'bgp_id':'all', 'instance':'all'})
@@ -6,7 +6,10 @@ from genie.libs.sdk.triggers.unconfigconfig.unconfigconfig import TriggerUnconfi
 from ats.utils.objects import NotExists
 
 # Which key to exclude for Vlan Ops comparison
-vlan_exclude = ['maker']
+vlan_exclude = frozenset(['maker'])
+
+# Vlan ids 2 to 1001, shared by the requirements below
+vlan_regex = '(?P<vlan>^([2-9]|[1-9][0-9]{1,2}|100[01]))$'
 
 class TriggerUnconfigConfigVlan(TriggerUnconfigConfig):
     """Unconfigure and reapply the whole configurations of dynamically learned vlan(s)."""
@@ -60,8 +63,7 @@ class TriggerUnconfigConfigVlan(TriggerUnconfigConfig):
     """
 
     mapping = Mapping(requirements={'ops.vlan.vlan.Vlan':{
-                                        'requirements':[['info','vlans','(?P<vlan>^([2-9]|[1-9][0-9]|[1-9][0-9][0-9]|[1][0][0][0-1]))$'\
-                                                            ,'vlan_id','(?P<vlan>^([2-9]|[1-9][0-9]|[1-9][0-9][0-9]|[1][0][0][0-1]))$'],
+                                        'requirements':[['info','vlans',vlan_regex,'vlan_id',vlan_regex],
                                                         ['info','vlans','(?P<vlan>.*)','shutdown',False]],
                                         'kwargs': {'attributes': ['info']},
                                         'all_keys':True,
@@ -73,7 +75,8 @@ class TriggerUnconfigConfigVlan(TriggerUnconfigConfig):
                       verify_ops={'ops.vlan.vlan.Vlan':{
                                     'requirements': [['info','vlans', NotExists('(?P<vlan>.*)')]],
                                     'kwargs':{'attributes':['info']},
-                                    'exclude': vlan_exclude}},
+                                    'exclude': vlan_exclude,
+                                    'poll_backoff': 1}},
                       num_values={'vlan':1})
 
 